@@ -12,14 +12,17 @@ import random
 import os
 import matplotlib.pyplot as plt
 from datetime import datetime
-import hashlib
+import threading
 import time
+from ulid_utils import ULID_PATTERN, new_ulid_state, next_ulid, ulid_bounds
 
 st.set_page_config(
     page_title="英语语法能力测试",
     layout="wide"
 )
 
+RESULTS_CSV = 'test_results.csv'
+
 # ========== 第1步：加载题库（只执行一次） ==========
 @st.cache_data
 def load_question_bank():
@@ -121,10 +124,30 @@ def init_session_state():
     if 'test_id' not in st.session_state:
         st.session_state.test_id = ""
     
+    if 'saved_test_id' not in st.session_state:
+        st.session_state.saved_test_id = ""
+    
     # 历史记录
     if 'test_history' not in st.session_state:
         st.session_state.test_history = []
 
+# ========== 测试ID生成（ULID格式） ==========
+# 编码规则见ulid_utils；姓名单独存放在user_name字段中。
+# 生成器状态按进程共享：同一进程内ID严格递增；多个进程之间只保证毫秒级的
+# 先后顺序，同一毫秒内的ID靠80位随机数保证不重复，但相对顺序不确定
+@st.cache_resource
+def get_test_id_state():
+    """ID生成器状态 - 本进程所有会话共享，脚本重新运行时不重置"""
+    state = new_ulid_state()
+    state['lock'] = threading.Lock()
+    return state
+
+def new_test_id():
+    """生成单调递增、可按时间排序的测试ID"""
+    state = get_test_id_state()
+    with state['lock']:
+        return next_ulid(state, time.time_ns() // 1_000_000)
+
 # ========== 第3步：题目选择逻辑 ==========
 def select_question(question_bank, target_difficulty):
     """选择一道题目 - 确保不重复"""
@@ -318,7 +341,7 @@ def save_test_result():
         'hard_count': difficulty_counts['hard']
     }
     
-    csv_file = 'test_results.csv'
+    csv_file = RESULTS_CSV
     file_exists = os.path.exists(csv_file)
     
     df_result = pd.DataFrame([result_data])
@@ -332,6 +355,39 @@ def save_test_result():
     
     return csv_file
 
+@st.cache_resource(max_entries=1)
+def load_results_index(csv_file, mtime_ns, size):
+    """加载成绩表索引 - 以文件修改时间和大小为缓存键，文件不变时不重复排序
+
+    返回 (按测试ID排序的新记录, 旧格式记录)，两者均为共享对象，只读使用。
+    """
+    df = pd.read_csv(csv_file, dtype={'test_id': str})
+    is_ulid = df['test_id'].str.fullmatch(ULID_PATTERN.pattern, na=False)
+    sorted_df = df[is_ulid].set_index('test_id').sort_index()
+    # 旧格式的测试ID（姓名_日期_哈希）无法按ID定位，改用timestamp列筛选
+    legacy_df = df[~is_ulid].set_index('test_id')
+    return sorted_df, legacy_df
+
+def load_results_by_time(start, end, csv_file=RESULTS_CSV):
+    """按时间区间查询测试结果 - 在排序后的测试ID索引上二分定位"""
+    if not os.path.exists(csv_file):
+        return pd.DataFrame()
+    
+    stat = os.stat(csv_file)
+    sorted_df, legacy_df = load_results_index(csv_file, stat.st_mtime_ns, stat.st_size)
+    lower, upper = ulid_bounds(start, end)
+    left = sorted_df.index.searchsorted(lower, side='left')
+    right = sorted_df.index.searchsorted(upper, side='right')
+    result = sorted_df.iloc[left:right]
+    
+    if not legacy_df.empty:
+        start_text = start.strftime('%Y-%m-%d %H:%M:%S')
+        end_text = end.strftime('%Y-%m-%d %H:%M:%S')
+        in_range = legacy_df['timestamp'].between(start_text, end_text)
+        result = pd.concat([legacy_df[in_range], result])
+    
+    return result
+
 def show_results_with_charts():
     """显示完整的结果页面"""
     st.markdown("## 测试结果")
@@ -410,19 +466,20 @@ def show_results_with_charts():
                 autopct='%1.1f%%', colors=colors)
         st.pyplot(fig2)
     
-    # 保存测试历史
-    st.session_state.test_history.append({
-        "user_name": st.session_state.user_name,
-        "test_id": st.session_state.test_id,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "score": f"{score}/{max_score}",
-        "percentage": percentage,
-        "total_questions": total_questions,
-        "correct_count": correct_count
-    })
-    
-    # 保存到CSV
-    csv_file = save_test_result()
+    # 保存测试历史和CSV（页面重新运行时不重复保存）
+    if st.session_state.saved_test_id != st.session_state.test_id:
+        st.session_state.test_history.append({
+            "user_name": st.session_state.user_name,
+            "test_id": st.session_state.test_id,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "score": f"{score}/{max_score}",
+            "percentage": percentage,
+            "total_questions": total_questions,
+            "correct_count": correct_count
+        })
+        save_test_result()
+        st.session_state.saved_test_id = st.session_state.test_id
+    csv_file = RESULTS_CSV
     
     # 下载报告
     st.markdown("---")
@@ -455,6 +512,20 @@ def show_results_with_charts():
             )
     
     st.success(f"测试结果已保存到: {csv_file}")
+    
+    # 按时间查询成绩
+    st.markdown("---")
+    st.subheader("按时间查询成绩")
+    today = datetime.now().date()
+    date_range = st.date_input("选择日期范围", value=(today, today), max_value=today)
+    if len(date_range) == 2:
+        start = datetime.combine(date_range[0], datetime.min.time())
+        end = datetime.combine(date_range[1], datetime.max.time())
+        df_range = load_results_by_time(start, end, csv_file)
+        if df_range.empty:
+            st.info("该时间范围内没有测试记录")
+        else:
+            st.dataframe(df_range, use_container_width=True)
 
 # ========== 第6步：主程序 ==========
 def main():
@@ -508,7 +579,7 @@ def main():
             if st.button("开始测试", type="primary"):
                 if user_name.strip():
                     st.session_state.user_name = user_name.strip()
-                    st.session_state.test_id = f"{user_name}_{datetime.now().strftime('%Y%m%d')}_{hashlib.md5(str(time.time()).encode()).hexdigest()[:6]}"
+                    st.session_state.test_id = new_test_id()
                     st.session_state.test_started = True
                     st.session_state.test_finished = False
                     st.session_state.question_number = 1
@@ -544,8 +615,7 @@ def main():
         
         if st.button("重新测试", type="primary"):
             # 生成新的测试ID
-            new_test_id = f"{st.session_state.user_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            st.session_state.test_id = new_test_id
+            st.session_state.test_id = new_test_id()
             
             # 重置测试状态
             st.session_state.test_started = True
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""测试ID生成与时间区间边界"""
+
+from datetime import datetime, timedelta
+
+from ulid_utils import (RANDOM_BITS, RANDOM_MAX, ULID_PATTERN, encode_ulid,
+                        new_ulid_state, next_ulid, ulid_bounds)
+
+def test_ids_sort_in_creation_order():
+    state = new_ulid_state()
+    ids = [next_ulid(state, 1_700_000_000_000 + i // 3) for i in range(300)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert all(ULID_PATTERN.fullmatch(i) for i in ids)
+
+def test_monotonic_within_same_millisecond():
+    state = new_ulid_state()
+    ids = [next_ulid(state, 1_700_000_000_000) for _ in range(5)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 5
+
+def test_monotonic_when_clock_goes_back():
+    state = new_ulid_state()
+    first = next_ulid(state, 1_700_000_000_005)
+    second = next_ulid(state, 1_700_000_000_000)
+    assert second > first
+
+def test_monotonic_when_random_part_overflows():
+    state = new_ulid_state()
+    state['last_ms'] = 1_700_000_000_000
+    state['last_random'] = RANDOM_MAX - 1
+    before = next_ulid(state, 1_700_000_000_000)
+    assert before == encode_ulid((1_700_000_000_000 << RANDOM_BITS) | RANDOM_MAX)
+    after = next_ulid(state, 1_700_000_000_000)
+    assert after > before
+    assert state['last_ms'] == 1_700_000_000_001
+
+def test_bounds_include_both_endpoints():
+    start = datetime(2026, 1, 1, 8, 0, 0)
+    end = start + timedelta(hours=1)
+    lower, upper = ulid_bounds(start, end)
+
+    at_start = next_ulid(new_ulid_state(), int(start.timestamp() * 1000))
+    at_end = next_ulid(new_ulid_state(), int(end.timestamp() * 1000))
+    before = next_ulid(new_ulid_state(), int(start.timestamp() * 1000) - 1)
+    after = next_ulid(new_ulid_state(), int(end.timestamp() * 1000) + 1)
+
+    assert lower <= at_start <= upper
+    assert lower <= at_end <= upper
+    assert before < lower
+    assert after > upper
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试ID（ULID格式）的编码与生成
+
+前48位为毫秒时间戳，后80位为随机数，Crockford Base32编码为26个字符，
+按字符串排序即按时间排序。
+"""
+
+import os
+import re
+
+ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ULID_PATTERN = re.compile(r"[0-9A-HJKMNP-TV-Z]{26}")
+RANDOM_BITS = 80
+RANDOM_MAX = (1 << RANDOM_BITS) - 1
+
+def encode_ulid(value):
+    """将128位整数编码为26位Crockford Base32字符串"""
+    chars = []
+    for _ in range(26):
+        chars.append(ULID_ALPHABET[value & 0x1F])
+        value >>= 5
+    return "".join(reversed(chars))
+
+def ulid_bounds(start, end):
+    """返回时间区间[start, end]对应的最小和最大测试ID（两端都包含）"""
+    start_ms = int(start.timestamp() * 1000)
+    end_ms = int(end.timestamp() * 1000)
+    return encode_ulid(start_ms << RANDOM_BITS), encode_ulid((end_ms << RANDOM_BITS) | RANDOM_MAX)
+
+def new_ulid_state():
+    """生成器状态：上一个ID的时间戳和随机部分"""
+    return {'last_ms': 0, 'last_random': 0}
+
+def next_ulid(state, now_ms):
+    """根据当前毫秒时间生成下一个ID，保证在同一个state内严格递增
+
+    调用方负责加锁。不同进程各自持有state，它们之间只有毫秒级的先后顺序，
+    同一毫秒内的ID靠80位随机数区分，不保证相对顺序。
+    """
+    if now_ms > state['last_ms']:
+        state['last_ms'] = now_ms
+        state['last_random'] = int.from_bytes(os.urandom(10), 'big')
+    elif state['last_random'] < RANDOM_MAX:
+        # 同一毫秒内（或时钟回拨）：随机部分加1，保证单调
+        state['last_random'] += 1
+    else:
+        # 随机部分溢出：借用下一毫秒
+        state['last_ms'] += 1
+        state['last_random'] = int.from_bytes(os.urandom(10), 'big')
+    return encode_ulid((state['last_ms'] << RANDOM_BITS) | state['last_random'])